@@ -2,7 +2,11 @@
 REST-based node that interfaces with WEI and provides a USB camera interface
 """
 
+import argparse
+import sys
 from pathlib import Path
+from threading import Condition, Event, Thread
+from typing import Union
 
 import cv2
 import numpy as np
@@ -17,6 +21,38 @@ from wei.types.step_types import (
 )
 from wei.utils import extract_version
 
+
+def fourcc_code(value: str) -> str:
+    """Checks that a pixel format is a four character code (e.g. "MJPG")"""
+    if value and len(value) != 4:
+        raise argparse.ArgumentTypeError(
+            f"pixel format '{value}' must be exactly 4 characters, e.g. MJPG or YUYV"
+        )
+    return value
+
+
+def jpeg_quality(value: str) -> int:
+    """Checks that a JPEG quality is an integer from 0 to 100"""
+    try:
+        quality = int(value)
+    except ValueError:
+        quality = -1
+    if not 0 <= quality <= 100:
+        raise argparse.ArgumentTypeError(
+            f"JPEG quality '{value}' must be an integer from 0 to 100"
+        )
+    return quality
+
+
+def capture_backend(name: str) -> int:
+    """Maps a capture backend name (e.g. "v4l2") to its cv2.CAP_* constant"""
+    backend = getattr(cv2, f"CAP_{name.upper()}", None) if name else cv2.CAP_ANY
+    # * Only accept backends this OpenCV build provides, not other CAP_* constants
+    if backend != cv2.CAP_ANY and backend not in cv2.videoio_registry.getBackends():
+        raise argparse.ArgumentTypeError(f"unknown OpenCV capture backend '{name}'")
+    return backend
+
+
 rest_module = RESTModule(
     name="camera_node",
     version=extract_version(Path(__file__).parent.parent / "pyproject.toml"),
@@ -29,6 +65,147 @@ rest_module.arg_parser.add_argument(
     help="the address of the camera to attach",
     default="/dev/video1",
 )
+rest_module.arg_parser.add_argument(
+    "--fourcc",
+    type=fourcc_code,
+    help="the pixel format to request from the camera (empty to keep the driver default)",
+    default="MJPG",
+)
+rest_module.arg_parser.add_argument(
+    "--capture_width",
+    type=int,
+    help="the frame width to request from the camera (0 to keep the driver default)",
+    default=0,
+)
+rest_module.arg_parser.add_argument(
+    "--capture_height",
+    type=int,
+    help="the frame height to request from the camera (0 to keep the driver default)",
+    default=0,
+)
+rest_module.arg_parser.add_argument(
+    "--jpeg_quality",
+    type=jpeg_quality,
+    help="the JPEG quality (0-100) used when saving pictures",
+    default=85,
+)
+rest_module.arg_parser.add_argument(
+    "--camera_backend",
+    type=capture_backend,
+    help="the OpenCV capture backend to use, e.g. v4l2, gstreamer or ffmpeg (empty or 'any' to pick one based on the platform)",
+    default="",
+)
+
+
+def camera_source(address: Union[str, int]) -> Union[str, int]:
+    """Converts a numeric camera address (e.g. "0") to the device index OpenCV expects"""
+    if isinstance(address, str) and address.lstrip("-").isdigit():
+        return int(address)
+    return address
+
+
+def camera_backend(state: State, source: Union[str, int]) -> int:
+    """Picks the capture backend up front so OpenCV doesn't probe each one in turn"""
+    if state.camera_backend != cv2.CAP_ANY:
+        return state.camera_backend
+    if sys.platform.startswith("linux"):
+        if isinstance(source, int) or source.startswith("/dev/"):
+            return cv2.CAP_V4L2
+    elif isinstance(source, int):
+        if sys.platform == "win32":
+            return cv2.CAP_MSMF
+        if sys.platform == "darwin":
+            return cv2.CAP_AVFOUNDATION
+    # * Files, URLs and pipelines still need OpenCV to find a backend that opens them
+    return cv2.CAP_ANY
+
+
+def open_camera(state: State) -> cv2.VideoCapture:
+    """Opens the camera device and applies the capture settings"""
+    source = camera_source(state.camera_address)
+    camera = cv2.VideoCapture(source, camera_backend(state, source))
+    if not camera.isOpened():
+        return camera
+    if not camera.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+        print("Failed to reduce capture buffer size")
+    if state.fourcc:
+        # * The format has to be negotiated before the resolution
+        camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*state.fourcc))
+        code = int(camera.get(cv2.CAP_PROP_FOURCC))
+        fourcc = "".join(chr((code >> 8 * i) & 0xFF) for i in range(4))
+        if fourcc != state.fourcc:
+            print(
+                f"Camera is using pixel format {fourcc!r} instead of {state.fourcc!r}"
+            )
+    if state.capture_width:
+        camera.set(cv2.CAP_PROP_FRAME_WIDTH, state.capture_width)
+    if state.capture_height:
+        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, state.capture_height)
+    return camera
+
+
+def grab_frames(state: State, camera: cv2.VideoCapture, stop: Event) -> None:
+    """Continuously grabs from the camera, only decoding frames that are requested.
+    The thread owns the camera and releases it once `stop` is set."""
+    retry_delay = 1.0
+    while not stop.is_set():
+        try:
+            grabbed = camera.grab()
+            if grabbed:
+                retry_delay = 1.0
+                if state.frame_requested:
+                    # * Decode into the previous frame's buffer to avoid reallocating it
+                    success, frame = camera.retrieve(state.latest_frame)
+                    if success:
+                        with state.frame_condition:
+                            state.latest_frame = frame
+                            state.frame_requested = False
+                            state.frame_condition.notify_all()
+        except Exception as e:
+            print(f"Error reading from camera at {state.camera_address}: {e}")
+            grabbed = False
+        if not grabbed and not stop.wait(retry_delay):
+            # * Back off (up to 30 s), then reopen the camera in case it was disconnected
+            retry_delay = min(retry_delay * 2, 30.0)
+            try:
+                camera.release()
+                camera = open_camera(state)
+                state.camera_opened = camera.isOpened()
+            except Exception as e:
+                print(f"Error reopening camera at {state.camera_address}: {e}")
+                state.camera_opened = False
+    camera.release()
+
+
+@rest_module.startup()
+def camera_startup(state: State) -> None:
+    """Opens the camera once and starts draining it on a background thread"""
+    state.frame_condition = Condition()
+    state.frame_requested = False
+    state.latest_frame = None
+    state.image_path = Path("~/.wei/temp").expanduser() / "image.jpg"
+    camera = open_camera(state)
+    state.camera_opened = camera.isOpened()
+    if not state.camera_opened:
+        print(f"Unable to open camera at {state.camera_address}")
+    state.grabber_stop = Event()
+    state.grabber = Thread(
+        target=grab_frames, args=[state, camera, state.grabber_stop], daemon=True
+    )
+    state.grabber.start()
+
+
+@rest_module.shutdown()
+def camera_shutdown(state: State) -> None:
+    """Stops the frame grabber, which releases the camera"""
+    grabber = getattr(state, "grabber", None)
+    if grabber is not None:
+        state.grabber_stop.set()
+        grabber.join(timeout=15.0)
+        if grabber.is_alive():
+            print(
+                "Frame grabber did not stop in time; the camera will be released when it does"
+            )
 
 
 @rest_module.action(
@@ -45,17 +222,24 @@ def take_picture(
     action: ActionRequest,
 ) -> StepResponse:
     """Function to take a picture"""
-    image_path = Path("~/.wei/temp").expanduser() / "image.jpg"
+    image_path = state.image_path
     image_path.parent.mkdir(parents=True, exist_ok=True)
+    frame = None
+    if state.camera_opened:
+        # * Ask the grabber to decode the next frame it grabs
+        with state.frame_condition:
+            state.frame_requested = True
+            if state.frame_condition.wait_for(
+                lambda: not state.frame_requested, timeout=5.0
+            ):
+                frame = state.latest_frame
+    params = [cv2.IMWRITE_JPEG_QUALITY, state.jpeg_quality]
     try:
-        camera = cv2.VideoCapture(state.camera_address)
-        _, frame = camera.read()
-        cv2.imwrite(str(image_path), frame)
-        camera.release()
+        cv2.imwrite(str(image_path), frame, params)
     except Exception:
         print("Camera unavailable, returning empty image")
         blank_image = np.zeros(shape=[512, 512, 3], dtype=np.uint8)
-        cv2.imwrite(str(image_path), blank_image)
+        cv2.imwrite(str(image_path), blank_image, params)
 
     return StepFileResponse(StepStatus.SUCCEEDED, files={"image": str(image_path)})
 
@@ -1,6 +1,15 @@
 """Base module tests."""
 
+import argparse
+import tempfile
+import time
 import unittest
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+from fastapi.datastructures import State
 
 
 class TestModule_Base(unittest.TestCase):
@@ -19,5 +28,140 @@ class TestImports(TestModule_Base):
         assert camera_rest_node
 
 
+class TestCameraSource(TestModule_Base):
+    """Test the conversion of camera addresses to OpenCV sources"""
+
+    def test_camera_source(self):
+        """Test that device indices are converted and paths are left alone"""
+        from camera_rest_node import camera_source
+
+        assert camera_source("0") == 0
+        assert camera_source("-1") == -1
+        assert camera_source(2) == 2
+        assert camera_source("/dev/video0") == "/dev/video0"
+
+
+class TestFourccCode(TestModule_Base):
+    """Test the validation of pixel format codes"""
+
+    def test_fourcc_code(self):
+        """Test that four character codes are accepted and others rejected"""
+        from camera_rest_node import fourcc_code
+
+        assert fourcc_code("MJPG") == "MJPG"
+        assert fourcc_code("") == ""
+        with self.assertRaises(argparse.ArgumentTypeError):
+            fourcc_code("MJPEG")
+
+
+class TestJpegQuality(TestModule_Base):
+    """Test the validation of JPEG qualities"""
+
+    def test_jpeg_quality(self):
+        """Test that qualities from 0 to 100 are accepted and others rejected"""
+        from camera_rest_node import jpeg_quality
+
+        assert jpeg_quality("85") == 85
+        assert jpeg_quality("0") == 0
+        assert jpeg_quality("100") == 100
+        for value in ["150", "-5", "high"]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                jpeg_quality(value)
+
+
+class TestCameraBackend(TestModule_Base):
+    """Test the selection of OpenCV capture backends"""
+
+    def test_capture_backend(self):
+        """Test that backend names are mapped to constants and typos are rejected"""
+        from camera_rest_node import capture_backend
+
+        assert capture_backend("v4l2") == cv2.CAP_V4L2
+        assert capture_backend("") == cv2.CAP_ANY
+        with self.assertRaises(argparse.ArgumentTypeError):
+            capture_backend("foo")
+        with self.assertRaises(argparse.ArgumentTypeError):
+            capture_backend("prop_fps")
+
+    def test_camera_backend(self):
+        """Test the platform defaults and explicit backend override"""
+        from camera_rest_node import camera_backend
+
+        state = State(state={"camera_backend": cv2.CAP_ANY})
+        with mock.patch("camera_rest_node.sys.platform", "linux"):
+            assert camera_backend(state, 0) == cv2.CAP_V4L2
+            assert camera_backend(state, "/dev/video0") == cv2.CAP_V4L2
+            assert camera_backend(state, "/tmp/video.avi") == cv2.CAP_ANY
+        with mock.patch("camera_rest_node.sys.platform", "win32"):
+            assert camera_backend(state, 0) == cv2.CAP_MSMF
+            assert camera_backend(state, "rtsp://camera/stream") == cv2.CAP_ANY
+        with mock.patch("camera_rest_node.sys.platform", "darwin"):
+            assert camera_backend(state, 0) == cv2.CAP_AVFOUNDATION
+        state.camera_backend = cv2.CAP_FFMPEG
+        with mock.patch("camera_rest_node.sys.platform", "linux"):
+            assert camera_backend(state, 0) == cv2.CAP_FFMPEG
+
+
+class TestTakePicture(TestModule_Base):
+    """Test the frame grabber and take_picture, using a video file as the camera"""
+
+    def setUp(self):
+        """Write a short MJPG video to stand in for the camera"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+        self.video_path = self.temp_dir / "camera.avi"
+        writer = cv2.VideoWriter(
+            str(self.video_path), cv2.VideoWriter_fourcc(*"MJPG"), 30, (320, 240)
+        )
+        for i in range(90):
+            writer.write(np.full((240, 320, 3), i, dtype=np.uint8))
+        writer.release()
+
+    def start_camera(self, camera_address: str) -> State:
+        """Run the startup handler against the given address"""
+        from camera_rest_node import camera_shutdown, camera_startup
+
+        state = State(
+            state={
+                "name": "camera_node",
+                "camera_address": camera_address,
+                "fourcc": "MJPG",
+                "capture_width": 0,
+                "capture_height": 0,
+                "jpeg_quality": 85,
+                "camera_backend": cv2.CAP_ANY,
+            }
+        )
+        camera_startup(state)
+        state.image_path = self.temp_dir / "image.jpg"
+        self.addCleanup(camera_shutdown, state)
+        return state
+
+    def test_take_picture(self):
+        """Test that pictures are written, the decode buffer is reused and shutdown stops the grabber"""
+        from camera_rest_node import camera_shutdown, take_picture
+
+        state = self.start_camera(str(self.video_path))
+        take_picture(state, None)
+        assert cv2.imread(str(state.image_path)).shape == (240, 320, 3)
+        first_frame = state.latest_frame
+        take_picture(state, None)
+        assert state.latest_frame is first_frame
+
+        camera_shutdown(state)
+        assert not state.grabber.is_alive()
+
+    def test_take_picture_without_camera(self):
+        """Test that a missing camera returns a blank image without waiting"""
+        from camera_rest_node import take_picture
+
+        state = self.start_camera(str(self.temp_dir / "missing.avi"))
+        start_time = time.time()
+        take_picture(state, None)
+        assert time.time() - start_time < 1.0
+        assert cv2.imread(str(state.image_path)).shape == (512, 512, 3)
+
+
 if __name__ == "__main__":
     unittest.main()